@@ -2,25 +2,30 @@
 # Date: 27/02/2024
 
 
+import numpy as np
+
 import interest
+import newtons
 
 
 def price_zero_coupon_bond_discrete(face_value: int, years_to_maturity: int, interest_rate: float, compounding_frequency_yr: int):
     """
     Calculate the price of a zero coupon bond using discrete compound interest.
+    Each argument may also be a numpy array to price many bonds at once, in which case
+    the arguments are broadcast against each other.
 
     Args:
-        face_value: int
+        face_value: int | np.ndarray
             The face value of the bond.
-        years_to_maturity: int
+        years_to_maturity: int | np.ndarray
             The number of years until the bond matures.
-        interest_rate: float
+        interest_rate: float | np.ndarray
             The yield rate of the bond.
-        compounding_frequency_yr: int
+        compounding_frequency_yr: int | np.ndarray
             The frequency at which the yield is compounded.
 
     Returns:
-        price: float
+        price: float | np.ndarray
             The price of the bond.
     """
 
@@ -35,17 +40,19 @@ def price_zero_coupon_bond_discrete(face_value: int, years_to_maturity: int, int
 def price_zero_coupon_bond_continuous(face_value: int, years_to_maturity: int, interest_rate: float):
     """
     Calculate the price of a zero coupon bond using continuous compound interest.
+    Each argument may also be a numpy array to price many bonds at once, in which case
+    the arguments are broadcast against each other.
 
     Args:
-        face_value: int
+        face_value: int | np.ndarray
             The face value of the bond.
-        years_to_maturity: int
+        years_to_maturity: int | np.ndarray
             The number of years until the bond matures.
-        interest_rate: float
+        interest_rate: float | np.ndarray
             The yield rate of the bond.
 
     Returns:
-        price: float
+        price: float | np.ndarray
             The price of the bond.
     """
 
@@ -57,7 +64,7 @@ def price_zero_coupon_bond_continuous(face_value: int, years_to_maturity: int, i
     return price
 
 
-def price_zero_coupon_bond_nonconstant_yield(face_value: int, years_to_maturity: int, yield_function):
+def price_zero_coupon_bond_nonconstant_yield(face_value: int, years_to_maturity: int, yield_function, smooth: bool = False):
     """
     Calculate the price of a zero coupon bond with a nonconstant yield.
 
@@ -68,6 +75,8 @@ def price_zero_coupon_bond_nonconstant_yield(face_value: int, years_to_maturity:
             The number of years until the bond matures.
         yield_function: function
             A function that takes a single argument, the time to maturity, and returns the yield at that time.
+        smooth: bool
+            Whether the yield function is smooth, see interest.integrate_yield.
 
     Returns:
         price: float
@@ -76,7 +85,7 @@ def price_zero_coupon_bond_nonconstant_yield(face_value: int, years_to_maturity:
 
     price = face_value * \
         interest.nonconstant_yield_discounted(
-            yield_function, years_to_maturity)
+            yield_function, years_to_maturity, smooth)
 
     return price
 
@@ -84,70 +93,85 @@ def price_zero_coupon_bond_nonconstant_yield(face_value: int, years_to_maturity:
 def price_coupon_bearing_bond_discrete(face_value: int, years_to_maturity: int, coupon_rate: float, interest_rate: float, compounding_frequency_yr: int):
     """
     Calculate the price of a coupon bearing bond using discrete compound interest.
+    Each argument may also be a numpy array to price many bonds at once, in which case
+    the arguments are broadcast against each other.
 
     Args:
-        face_value: int
+        face_value: int | np.ndarray
             The face value of the bond.
-        years_to_maturity: int
+        years_to_maturity: int | np.ndarray
             The number of years until the bond matures.
-        coupon_rate: float
+        coupon_rate: float | np.ndarray
             The annual coupon rate of the bond.
-        interest_rate: float
+        interest_rate: float | np.ndarray
             The yield rate of the bond.
-        compounding_frequency_yr: int
+        compounding_frequency_yr: int | np.ndarray
             The frequency at which the yield is compounded.
 
     Returns:
-        price: float
+        price: float | np.ndarray
             The price of the bond.
     """
 
-    # Define subfunction for computing the present value of the coupon payments
-    def coupon_payment_present_value(coupon_rate_annual: float, interest_rate: float, compounding_frequency_yr: int, years_to_maturity: int):
-        """
-        Calculate the present value of the coupon payments of a bond.
+    rate = interest_rate / compounding_frequency_yr
+    num_periods = years_to_maturity * compounding_frequency_yr
 
-        Args:
-            coupon_rate_annual: float
-                The annual coupon rate of the bond.
-            face_value: int
-                The face value of the bond.
-            interest_rate: float
-                The yield rate of the bond.
-            compounding_frequency_yr: int
-                The frequency at which the yield is compounded.
-            years_to_maturity: int
-                The number of years until the bond matures.
+    # Log of the discount factor (1 + rate)^(-num_periods), shared by the coupon
+    # annuity and the face value so the power is only taken once
+    log_beta = -num_periods * np.log1p(rate)
 
-        Returns:
-            payment_value: float
-                The present value of the coupon payments of the bond.
-        """
+    # Calculate the periodic coupon payment
+    coupon_payment = coupon_rate * face_value / compounding_frequency_yr
 
-        coupon_rate_adjusted = coupon_rate_annual / compounding_frequency_yr
+    # Present value of the coupon payments. The annuity factor (1 - beta) / rate
+    # is computed via expm1 to avoid cancellation for small rates
+    annuity_factor = -np.expm1(log_beta) / rate
+    coupon_value = coupon_payment * annuity_factor
 
-        numerator = (1 - interest.discrete_compound_interest_discounted(interest_rate, years_to_maturity, compounding_frequency_yr))
+    # Face value discounted to the present
+    discounted_face_value = face_value * np.exp(log_beta)
 
-        denominator = interest_rate / compounding_frequency_yr
+    price = coupon_value + discounted_face_value
 
-        payment_value = coupon_rate_adjusted * (numerator / denominator)
+    return price
+
+
+def yield_to_maturity_continuous(cashflows: np.ndarray, times: np.ndarray, present_value: float, y_0: float, tolerance: float, max_iterations: int):
+    """
+    Calculate the yield to maturity of a bond with continuous compounding using the accelerated Newton iteration,
+    i.e. the y solving present_value = sum_i C_i e^{-y t_i}.
+
+    Args:
+        cashflows: np.ndarray
+            The cashflows of the bond, with the face value included in the last cashflow.
+        times: np.ndarray
+            The time (in years) of each cashflow.
+        present_value: float
+            The market price of the bond.
+        y_0: float
+            The initial guess of the yield.
+        tolerance: float
+            The tolerance of the approximation.
+        max_iterations: int
+            The maximum number of iterations.
 
-        return payment_value
+    Returns:
+        yield_to_maturity: float
+            The yield to maturity of the bond.
+    """
 
-    # Initialise the price
-    price = 0
+    cashflows = np.asarray(cashflows, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
 
-    # Calculate the annual coupon payment
-    coupon_rate_annual = coupon_rate * face_value
+    # Specialise f and f' to this bond, the weighted cashflows are fixed across iterations
+    weighted_cashflows = cashflows * times
 
-    # Add the present value of the coupon payments
-    coupon_value = coupon_payment_present_value(
-        coupon_rate_annual, interest_rate, compounding_frequency_yr, years_to_maturity)
-    price += coupon_value
+    def f_and_f_prime(y: float):
+        betas = np.exp(-y * times)
 
-    # Add the face value discounted to the present
-    discounted_face_value = price_zero_coupon_bond_discrete(
-        face_value, years_to_maturity, interest_rate, compounding_frequency_yr)
-    price += discounted_face_value
+        return np.vdot(cashflows, betas) - present_value, -np.vdot(weighted_cashflows, betas)
 
-    return price
+    yield_to_maturity, _ = newtons.accelerated_newtons_method(
+        f_and_f_prime, y_0, tolerance, max_iterations)
+
+    return yield_to_maturity
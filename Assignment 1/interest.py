@@ -2,8 +2,13 @@
 # Date: 27/02/2024
 
 import math
+import numpy as np
 from scipy import integrate
 
+# Gauss-Legendre nodes and weights on [-1, 1] for integrating yield functions.
+# 64 points integrates smooth yield curves to machine precision.
+GAUSS_LEGENDRE_NODES, GAUSS_LEGENDRE_WEIGHTS = np.polynomial.legendre.leggauss(64)
+
 
 def discrete_compound_interest_accumuated(interest_rate: float, maturity_yrs: int, compounding_frequency_yr: int):
     """
@@ -22,8 +27,9 @@ def discrete_compound_interest_accumuated(interest_rate: float, maturity_yrs: in
             The accumulated ratio of the sum of money.
     """
 
-    alpha = (1 + interest_rate / compounding_frequency_yr) ** (
-        maturity_yrs * compounding_frequency_yr)
+    base = 1 + interest_rate / compounding_frequency_yr
+
+    alpha = base ** (maturity_yrs * compounding_frequency_yr)
 
     return alpha
 
@@ -67,7 +73,7 @@ def continuous_compound_interest_accumulated(interest_rate: float, maturity_yrs:
             The accumulated ratio of the sum of money.
     """
 
-    alpha = math.exp(interest_rate * maturity_yrs)
+    alpha = np.exp(interest_rate * maturity_yrs)
 
     return alpha
 
@@ -87,7 +93,7 @@ def continuous_compound_interest_discounted(interest_rate: float, maturity_yrs:
             The discounted ratio of the sum of money.
     """
 
-    beta = math.exp(-interest_rate * maturity_yrs)
+    beta = np.exp(-interest_rate * maturity_yrs)
 
     return beta
 
@@ -105,7 +111,52 @@ def check_integration_error(error: float):
         print(f"Warning: High integration error. Val: {error}")
 
 
-def nonconstant_yield_accumulated(yield_function: callable, maturity_yrs: int):
+def integrate_yield(yield_function: callable, maturity_yrs: int, smooth: bool = False):
+    """
+    Integrate a yield function from 0 to the maturity.
+    By default this uses adaptive quadrature and warns if the error estimate is high.
+    If the yield function is known to be smooth, a fixed Gauss-Legendre rule is used
+    instead, evaluating the yield function on all nodes at once if it accepts numpy arrays.
+    This is much faster but silently loses accuracy for yields with jumps or kinks.
+
+    Args:
+        yield_function: function
+            The yield function.
+        maturity_yrs: int
+            The number of years the sum of money is invested for.
+        smooth: bool
+            Whether the yield function is smooth over [0, maturity_yrs].
+
+    Returns:
+        int_val: float
+            The integral of the yield function over [0, maturity_yrs].
+    """
+
+    if not smooth:
+        int_val, error = integrate.quad(yield_function, 0, maturity_yrs)
+        check_integration_error(error)
+
+        return int_val
+
+    half_width = 0.5 * maturity_yrs
+
+    # Map the nodes from [-1, 1] onto [0, maturity_yrs]
+    times = half_width * GAUSS_LEGENDRE_NODES + half_width
+    try:
+        yields = yield_function(times)
+    except (TypeError, ValueError):
+        # Yield function only handles scalars (e.g. uses math.exp or branches with if)
+        yields = np.vectorize(yield_function, otypes=[float])(times)
+
+    # Constant yield functions may return a scalar
+    yields = np.broadcast_to(yields, times.shape)
+
+    int_val = half_width * np.dot(GAUSS_LEGENDRE_WEIGHTS, yields)
+
+    return int_val
+
+
+def nonconstant_yield_accumulated(yield_function: callable, maturity_yrs: int, smooth: bool = False):
     """
     Calculate the accumulated ratio of a sum of money after a given number of years at a given nonconstant yield.
 
@@ -114,21 +165,22 @@ def nonconstant_yield_accumulated(yield_function: callable, maturity_yrs: int):
             The yield function.
         maturity_yrs: int
             The number of years the sum of money is invested for.
+        smooth: bool
+            Whether the yield function is smooth, see integrate_yield.
 
     Returns:
         alpha: float
             The accumulated ratio of the sum of money.
     """
 
-    int_val, error = integrate.quad(yield_function, 0, maturity_yrs)
-    check_integration_error(error)
+    int_val = integrate_yield(yield_function, maturity_yrs, smooth)
 
     alpha = math.exp(int_val)
 
     return alpha
 
 
-def nonconstant_yield_discounted(yield_function: callable, maturity_yrs: int):
+def nonconstant_yield_discounted(yield_function: callable, maturity_yrs: int, smooth: bool = False):
     """
     Calculate the discounted ratio of a sum of money after a given number of years at a given nonconstant yield.
 
@@ -137,14 +189,15 @@ def nonconstant_yield_discounted(yield_function: callable, maturity_yrs: int):
             The yield function.
         maturity_yrs: int
             The number of years the sum of money is invested for.
+        smooth: bool
+            Whether the yield function is smooth, see integrate_yield.
 
     Returns:
         beta: float
             The discounted ratio of the sum of money.
     """
 
-    int_val, error = integrate.quad(yield_function, 0, maturity_yrs)
-    check_integration_error(error)
+    int_val = integrate_yield(yield_function, maturity_yrs, smooth)
 
     beta = math.exp(-int_val)
 
@@ -2,11 +2,9 @@
 # Date: 27/02/2024
 
 import math
-from typing import Dict
 from colorama import Fore
 import numpy as np
 import sys
-from IPython.display import display
 
 
 import bond
@@ -18,6 +16,12 @@ QUARTLERLY = 4
 
 EPS = 0.01
 
+# Bond cashflows for question 3 (Table 1) and the time of each cashflow
+Q3_CASHFLOWS = np.array(
+    [2.3, 2.9, 3.0, 3.2, 4.0, 3.8, 4.2, 4.8, 5.5, 105.0], dtype=np.float64
+)
+Q3_TIMES = np.arange(1, len(Q3_CASHFLOWS) + 1, dtype=np.float64)
+
 
 def q1():
     print("Question 1:")
@@ -64,10 +68,11 @@ def q1():
     q = "iii"
 
     def yield_function(t):
-        return 0.06 + 0.2 * t * math.exp(-(t**2))
+        return 0.06 + 0.2 * t * np.exp(-(t**2))
 
+    # The yield curve is smooth, so the fast fixed quadrature rule is exact
     price_iii = bond.price_zero_coupon_bond_nonconstant_yield(
-        face_value, years_to_maturity, yield_function
+        face_value, years_to_maturity, yield_function, smooth=True
     )
     display.display_question(q, subquestions[q])
     display.display_answer(price_iii)
@@ -95,7 +100,7 @@ def q1():
     display.display_answer(price_b)
 
 
-def q2():
+def q2(plot_graphs: bool = False):
     print("Question 2:")
     print("Consider the cash flow C_0 = -3x, C_1 = 5, C_2 = x")
     print("(at periods 0, 1, 2 respectively) for some x > 0")
@@ -108,59 +113,69 @@ def q2():
 
     r = 0.05
 
-    def cash_flow(k, x):
-        return -3 * x if k == 0 else (5 if k == 1 else x)
+    x_min = -100.0
+    x_max = 100.0
+    x_step = 0.01
+    xs = np.arange(x_min, x_max, x_step)
 
-    def accept_condition(p):
-        return p > 0
+    # Cash flow coefficients for C_k = a_k * x + b_k
+    x_coeffs = np.array([-3.0, 0.0, 1.0])
+    const_coeffs = np.array([0.0, 5.0, 0.0])
 
-    # Function to calculate present value based on some value of x
-    def present_value(x: float) -> float:
-        present_value = 0
+    def discount_factors(rates: np.ndarray) -> np.ndarray:
+        """
+        Discount factors d(k) for each rate and k in {0, 1, 2} as an (nr, 3) array.
+        """
 
-        for k in range(2 + 1):
-            beta = interest.discrete_compound_interest_discounted(r, k, 1)
-            undiscounted_cash_flow_year_k = cash_flow(k, x)
-            discounted_cash_flow_year_k = undiscounted_cash_flow_year_k * beta
+        ks = np.arange(2 + 1)
 
-            present_value += discounted_cash_flow_year_k
+        return interest.discrete_compound_interest_discounted(
+            rates[:, None], ks[None, :], 1
+        )
 
-        return present_value
+    # P is linear in x for a fixed rate: P = slope * x + intercept
+    def present_value_coefficients(rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        betas = discount_factors(rates)
 
-    cash_flows_x: Dict[float, float] = {}
-    x_min = -100.0
-    x_max = 100.0
-    x_step = 0.01
-    accept_min_x = None
-    accept_max_x = None
+        slopes = betas @ x_coeffs
+        intercepts = betas @ const_coeffs
 
-    # Loop over a wide range of x
-    for x in np.arange(x_min, x_max, x_step):
-        cash_flow_x = present_value(x)
+        return slopes, intercepts
 
-        cash_flows_x[x] = cash_flow_x
+    # Present value of every x for every rate given, as an (nr, nx) grid
+    def present_value_grid(rates: np.ndarray) -> np.ndarray:
+        slopes, intercepts = present_value_coefficients(rates)
 
-        if accept_condition(cash_flow_x):
-            # Min
-            if not accept_min_x:
-                accept_min_x = x
-            elif x < accept_min_x:
-                accept_min_x = x
+        # Fill the grid in place rather than allocating a second (nr, nx) temporary
+        grid = np.multiply.outer(slopes, xs)
+        grid += intercepts[:, None]
 
-            # Max
-            if not accept_max_x:
-                accept_max_x = x
-            elif x > accept_max_x:
-                accept_max_x = x
+        return grid
 
-    if accept_min_x == x_min:
-        accept_min_x = -math.inf
+    # Solve P = 0 directly, P > 0 is then the half-line on one side of the root
+    slopes, intercepts = present_value_coefficients(np.array([r]))
+    slope = slopes[0]
+    intercept = intercepts[0]
 
-    if accept_max_x == x_max:
+    if slope > 0:
+        accept_min_x = -intercept / slope
         accept_max_x = math.inf
+    elif slope < 0:
+        accept_min_x = -math.inf
+        accept_max_x = -intercept / slope
+    else:
+        # P is constant in x
+        accept_min_x, accept_max_x = (-math.inf, math.inf) if intercept > 0 else (None, None)
+
+    if plot_graphs:
+        # Imported here so matplotlib is only loaded when plotting
+        import plot
 
-    # Visualise cash flow on a graph
-    # plot.plot_dictionary(cash_flows_x, "x", "P", "Present value of cash flow")
+        # Visualise cash flow on a graph
+        cash_flows_x = present_value_grid(np.array([r]))[0]
+        plot.plot_dictionary(
+            dict(zip(xs, cash_flows_x)), "x", "P", "Present value of cash flow"
+        )
 
     print(
         f"Range of x such that P > 0 when r = {r * 100}%: {accept_min_x} < x < {accept_max_x}"
@@ -173,21 +188,64 @@ def q2():
         "a unique strictly positive IRR?",
     )
 
-    xr_grid = {}
+    rs = np.arange(0.0, 1.0, 0.01)
+
+    xr_grid = present_value_grid(rs)
+
+    if plot_graphs:
+        import plot
+
+        plot.plot_surface_grid(
+            xs, rs, xr_grid, "x", "r", "P", "Present value of cash flow"
+        )
+
+    # Indices of the grid points where P is approximately 0
+    r_indices, x_indices = np.nonzero(np.abs(xr_grid) < EPS)
+
+    # Accepted (x, r) pairs as an (n, 2) array rather than a list of tuples
+    accept_xr = np.column_stack((xs[x_indices], rs[r_indices]))
 
-    accept_xr = []
+    for p, (x, r) in zip(xr_grid[r_indices, x_indices], accept_xr):
+        print(f"{round(p, 2):<6}, {round(x, 3):<6}, {round(r, 2):<6}")
 
-    for r in np.arange(0.0, 1.0, 0.01):
-        for x in np.arange(x_min, x_max, x_step):
-            p = present_value(x)
+    # Solve for the IRR of every x > 0 at once. In terms of the discount factor
+    # d = 1 / (1 + r), P(d) = (d^2 - 3) x + 5 d is increasing on [0, 1] with
+    # P(0) = -3x < 0, so bisecting on d finds the IRR for all x simultaneously.
+    # The product of the roots in d is -3, so the positive root is unique and
+    # r > 0 exactly when the root lies below d = 1.
+    def irr_bisection(x_vals: np.ndarray, num_iterations: int = 60) -> np.ndarray:
+        ks = np.arange(2 + 1)
 
-            # if p == 0:
-            xr_grid[(x, r)] = p
-            # print(f"{round(x, 3):<6}, {round(r, 3):<6}, {round(p, 3):<6}")
+        def present_value_at_discount(d: np.ndarray) -> np.ndarray:
+            d_powers = d[:, None] ** ks[None, :]
 
-            if abs(p) < EPS:
-                print(f"{round(p, 2):<6}, {round(x, 3):<6}, {round(r, 2):<6}")
-                accept_xr.append((x, r))
+            return (d_powers @ x_coeffs) * x_vals + d_powers @ const_coeffs
+
+        lo = np.zeros_like(x_vals)
+        hi = np.ones_like(x_vals)
+
+        for _ in range(num_iterations):
+            mid = 0.5 * (lo + hi)
+            above = present_value_at_discount(mid) > 0
+
+            hi = np.where(above, mid, hi)
+            lo = np.where(above, lo, mid)
+
+        d = 0.5 * (lo + hi)
+
+        # A strictly positive IRR needs P > 0 at r = 0, i.e. at d = 1
+        has_positive_irr = present_value_at_discount(np.ones_like(x_vals)) > 0
+
+        return np.where(has_positive_irr, 1 / d - 1, np.nan)
+
+    positive_xs = xs[xs > 0]
+    irrs = irr_bisection(positive_xs)
+
+    # The IRR stops being positive at the first x without one
+    no_irr_xs = positive_xs[np.isnan(irrs)]
+    x_upper = round(no_irr_xs.min(), 2) if no_irr_xs.size else math.inf
+
+    print(f"Range of x with a unique strictly positive IRR: 0 < x < {x_upper}")
 
 
 def q3():
@@ -206,24 +264,13 @@ def q3():
         + "functions f(y) and f'(y)"
     )
 
-    cashflows = [2.3, 2.9, 3.0, 3.2, 4.0, 3.8, 4.2, 4.8, 5.5, 105]
+    cashflows = Q3_CASHFLOWS
+    times = Q3_TIMES
     # Market price of the bond at t = 0
     PV = 100
 
-    def f(y):
-        return (
-            sum(
-                cashflows[t - 1]
-                * interest.continuous_compound_interest_discounted(y, t)
-                for t in range(1, len(cashflows) + 1)
-            )
-            - PV
-        )
-
-    def f_prime(y):
-        return -sum(
-            ((t * cashflows[t]) / ((1 + y) ** (t + 1))) for t in range(len(cashflows))
-        )
+    # f(y) = sum_i C_i e^{-y t_i} - PV and f'(y) = -sum_i t_i C_i e^{-y t_i}.
+    # Both are evaluated together in bond.yield_to_maturity_continuous
 
     # Part b (5 marks)
     print("Part b (5 marks)")
@@ -237,19 +284,30 @@ def q3():
 
     # Solve y using Newton's method given f and PV as inputs
 
-    approx, _, _ = newtons.newtons_method(f, f_prime, x_0, eps, 9999999)
+    approx = bond.yield_to_maturity_continuous(cashflows, times, PV, x_0, eps, 9999999)
 
     display.display_answer(approx, 5, False)
 
     # Part ii: Trying larger values of y_0
     print("Part ii: Trying with larger values of y_0")
 
-    y_0_vals = [x for x in np.arange(0.05, 0.25, 0.01)]
-    for y_0 in y_0_vals:
+    def f_and_f_prime_vectorised(y):
+        # Discount factors for each y (rows) and cashflow time (columns)
+        betas = np.exp(-np.multiply.outer(y, times))
+
+        return betas @ cashflows - PV, -(betas @ (cashflows * times))
+
+    y_0_vals = np.arange(0.05, 0.25, 0.01)
+
+    # Run Newton's method from every y_0 simultaneously
+    approxs, _ = newtons.newtons_method_vectorised(
+        f_and_f_prime_vectorised, y_0_vals, eps, 9999999
+    )
+
+    for y_0, approx in zip(y_0_vals, approxs):
         print(
             f"{Fore.CYAN}y_0 = {Fore.LIGHTRED_EX}{round(y_0, 2)}{Fore.WHITE}", end=": "
         )
-        approx, _, _ = newtons.newtons_method(f, f_prime, y_0, eps, 9999999, log=False)
         display.display_answer(approx, 10, False)
 
 
@@ -277,12 +335,14 @@ def q4():
 
 
 def main():
+    plot_graphs = "--plot" in sys.argv
+
     if len(sys.argv) > 1 and sys.argv[1].isdigit():
         question_number = int(sys.argv[1])
         if question_number == 1:
             q1()
         elif question_number == 2:
-            q2()
+            q2(plot_graphs)
         elif question_number == 3:
             q3()
         else:
@@ -290,7 +350,7 @@ def main():
     else:
         # Run all questions
         q1()
-        q2()
+        q2(plot_graphs)
         q3()
 
     return 0
@@ -2,6 +2,8 @@
 Implements Newton's method for approximating function roots
 """
 
+import numpy as np
+
 
 def derivative(f: callable, x: float, tolerance: float) -> float:
     """
@@ -42,6 +44,8 @@ def newtons_method(
     Args:
         f: function
             The function to find the root of.
+        f_prime: function
+            The derivative of the function.
         x_0: float
             The initial guess of the root.
         tolerance: float
@@ -60,22 +64,74 @@ def newtons_method(
             The number of iterations.
     """
 
-    x_n = [x_0]
+    def f_and_f_prime(x: float) -> tuple[float, float]:
+        return f(x), f_prime(x)
+
+    return newtons_method_fused(
+        f_and_f_prime,
+        x_0,
+        tolerance,
+        max_iterations,
+        generate_table,
+        log,
+        col_spaces,
+        precision,
+    )
+
+
+def newtons_method_fused(
+    f_and_f_prime: callable,
+    x_0: float,
+    tolerance: float,
+    max_iterations: int,
+    generate_table: bool = False,
+    log: bool = True,
+    col_spaces: list = [],
+    precision: int = 6,
+) -> tuple[float, list, int]:
+    """
+    Calculate the root of a function using Newton's method, where the function
+    and its derivative are evaluated together so they can share work.
+
+    Args:
+        f_and_f_prime: function
+            A function returning the tuple (f(x), f'(x)).
+        x_0: float
+            The initial guess of the root.
+        tolerance: float
+            The tolerance of the approximation.
+        max_iterations: int
+            The maximum number of iterations.
+        log: bool
+            Whether to log the iterations.
+
+    Returns:
+        x_n: float
+            The approximation of the root.
+        md_table_rows: list
+            The rows of the table in markdown format.
+        num_iterations: int
+            The number of iterations.
+    """
+
+    # Only the latest two iterates are needed, so keep them as scalars
+    this_x_n = x_0
 
     md_table_rows = []
     num_iterations = 0
 
+    f_x, f_prime_x = f_and_f_prime(x_0)
+
     for n in range(max_iterations):
-        last_x_n = x_n[-1]
+        last_x_n = this_x_n
 
-        derivative = f_prime(last_x_n)
-        if derivative == 0:
+        if f_prime_x == 0:
             raise Exception("Derivative is zero")
 
-        x_n.append(last_x_n - f(last_x_n) / derivative)
+        this_x_n = last_x_n - f_x / f_prime_x
 
-        this_x_n = x_n[-1]
-        last_x_n = x_n[-2]
+        # Evaluated once here and reused as the next iteration's step
+        f_x, f_prime_x = f_and_f_prime(this_x_n)
 
         diff = abs(this_x_n - last_x_n)
 
@@ -90,12 +146,145 @@ def newtons_method(
             if generate_table:
                 md_table_rows.append(table_row)
 
+        func_diff = abs(f_x)
+        if min(diff, func_diff) < tolerance:
+            # The approximation is within the tolerance
+            break
+
+        num_iterations += 1
+
+    return this_x_n, md_table_rows, num_iterations
+
+
+def newtons_method_vectorised(
+    f_and_f_prime: callable,
+    x_0: np.ndarray,
+    tolerance: float,
+    max_iterations: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the roots of a function from many initial guesses at once using
+    Newton's method. Each initial guess is iterated independently until it meets
+    the stopping criteria.
+
+    Args:
+        f_and_f_prime: function
+            A function taking an array of points and returning the tuple of
+            arrays (f(x), f'(x)) evaluated elementwise.
+        x_0: np.ndarray
+            The initial guesses of the root.
+        tolerance: float
+            The tolerance of the approximation.
+        max_iterations: int
+            The maximum number of iterations.
+
+    Returns:
+        x_n: np.ndarray
+            The approximation of the root for each initial guess.
+        num_iterations: np.ndarray
+            The number of iterations for each initial guess.
+    """
+
+    x_n = np.array(x_0, dtype=np.float64)
+
+    num_iterations = np.zeros(x_n.shape, dtype=np.int64)
+
+    # Guesses which have not yet met the stopping criteria
+    active = np.ones(x_n.shape, dtype=bool)
+
+    f_x, f_prime_x = f_and_f_prime(x_n)
+
+    for _ in range(max_iterations):
+        if np.any(f_prime_x[active] == 0):
+            raise Exception("Derivative is zero")
+
+        last_x_n = x_n[active]
+        this_x_n = last_x_n - f_x[active] / f_prime_x[active]
+        x_n[active] = this_x_n
+
+        f_x[active], f_prime_x[active] = f_and_f_prime(this_x_n)
+
+        x_diff = np.abs(this_x_n - last_x_n)
+        func_diff = np.abs(f_x[active])
+
+        converged = np.minimum(x_diff, func_diff) < tolerance
+
+        # Only the guesses still iterating count this iteration
+        num_iterations[active] += ~converged
+
+        active[active] = ~converged
+
+        if not np.any(active):
+            break
+
+    return x_n, num_iterations
+
+
+def accelerated_newtons_method(
+    f_and_f_prime: callable,
+    x_0: float,
+    tolerance: float,
+    max_iterations: int,
+) -> tuple[float, int]:
+    """
+    Calculate the root of a function using the accelerated Newton iteration of
+    Fernández-Torres, which reuses the previous iterate to reach convergence order
+    1 + sqrt(2) at the cost of one evaluation of f and f' per iteration.
+
+        x_{k+1} = x_k - f_k (f_k - f_{k-1}) (x_k - x_{k-1})
+                        / (f_k (f_k - f_{k-1}) - f_{k-1} f'_k (x_k - x_{k-1}))
+
+    The first step is a regular Newton step from x_0.
+
+    Args:
+        f_and_f_prime: function
+            A function returning the tuple (f(x), f'(x)).
+        x_0: float
+            The initial guess of the root.
+        tolerance: float
+            The tolerance of the approximation.
+        max_iterations: int
+            The maximum number of iterations.
+
+    Returns:
+        x_n: float
+            The approximation of the root.
+        num_iterations: int
+            The number of iterations.
+    """
+
+    last_x_n = x_0
+    last_f_x, f_prime_x = f_and_f_prime(last_x_n)
+
+    if f_prime_x == 0:
+        raise Exception("Derivative is zero")
+
+    # Bootstrap with a Newton step
+    this_x_n = last_x_n - last_f_x / f_prime_x
+    f_x, f_prime_x = f_and_f_prime(this_x_n)
+
+    num_iterations = 0
+
+    for _ in range(max_iterations):
         x_diff = abs(this_x_n - last_x_n)
-        func_diff = abs(f(this_x_n))
+        func_diff = abs(f_x)
         if min(x_diff, func_diff) < tolerance:
             # The approximation is within the tolerance
             break
 
+        x_delta = this_x_n - last_x_n
+        f_delta = f_x - last_f_x
+
+        denominator = f_x * f_delta - last_f_x * f_prime_x * x_delta
+        if denominator == 0:
+            raise Exception("Accelerated Newton step is undefined")
+
+        next_x_n = this_x_n - f_x * f_delta * x_delta / denominator
+
+        last_x_n, last_f_x = this_x_n, f_x
+        this_x_n = next_x_n
+        f_x, f_prime_x = f_and_f_prime(this_x_n)
+
         num_iterations += 1
 
-    return x_n[-1], md_table_rows, num_iterations
+    return this_x_n, num_iterations
@@ -1,4 +1,5 @@
 from typing import Dict
+import numpy as np
 import matplotlib.pyplot  as plt
 from mpl_toolkits.mplot3d import Axes3D
 
@@ -59,3 +60,39 @@ def plot_3d_dictionary(dictionary: Dict[float, float], x_label: str, y_label: st
     ax.set_title(title)
 
     plt.show()
+
+
+def plot_surface_grid(x_vals: np.ndarray, y_vals: np.ndarray, z_grid: np.ndarray, x_label: str, y_label: str, z_label: str, title: str):
+    """
+    Plot a surface from a grid of values.
+
+    Args:
+        x_vals: np.ndarray
+            The values along the x-axis, of length nx.
+        y_vals: np.ndarray
+            The values along the y-axis, of length ny.
+        z_grid: np.ndarray
+            The values of the surface with shape (ny, nx), where z_grid[i, j]
+            corresponds to (x_vals[j], y_vals[i]).
+        x_label: str
+            The label of the x-axis.
+        y_label: str
+            The label of the y-axis.
+        z_label: str
+            The label of the z-axis.
+        title: str
+            The title of the plot.
+    """
+
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+
+    x_mesh, y_mesh = np.meshgrid(x_vals, y_vals)
+
+    ax.plot_surface(x_mesh, y_mesh, z_grid, cmap='viridis')
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    ax.set_zlabel(z_label)
+    ax.set_title(title)
+
+    plt.show()
@@ -3,6 +3,7 @@
 
 
 import math
+import numpy as np
 import interest
 from lattice import BinLattice
 
@@ -17,6 +18,8 @@ def price_zero_coupon_bond_discrete(
 ):
     """
     Calculate the price of a zero coupon bond using discrete compound interest.
+    The face values, maturities and rates may be numpy arrays and follow numpy broadcasting,
+    e.g. a column of rates against a row of maturities gives a grid of prices.
 
     Args:
         face_value: int
@@ -47,6 +50,7 @@ def price_zero_coupon_bond_continuous(
 ):
     """
     Calculate the price of a zero coupon bond using continuous compound interest.
+    The face values, maturities and rates may be numpy arrays and follow numpy broadcasting.
 
     Args:
         face_value: int
@@ -71,7 +75,7 @@ def price_zero_coupon_bond_continuous(
 
 
 def price_zero_coupon_bond_nonconstant_yield(
-    face_value: int, years_to_maturity: int, yield_function
+    face_value: int, years_to_maturity: int, yield_function, smooth: bool = False
 ):
     """
     Calculate the price of a zero coupon bond with a nonconstant yield.
@@ -83,6 +87,8 @@ def price_zero_coupon_bond_nonconstant_yield(
             The number of years until the bond matures.
         yield_function: function
             A function that takes a single argument, the time to maturity, and returns the yield at that time.
+        smooth: bool
+            Whether the yield function is smooth, see interest.integrate_yield.
 
     Returns:
         price: float
@@ -90,7 +96,7 @@ def price_zero_coupon_bond_nonconstant_yield(
     """
 
     price = face_value * interest.nonconstant_yield_discounted(
-        yield_function, years_to_maturity
+        yield_function, years_to_maturity, smooth
     )
 
     return price
@@ -126,64 +132,62 @@ def price_coupon_bearing_bond_discrete(
             The price of the bond.
     """
 
-    # Define subfunction for computing the present value of the coupon payments
-    def coupon_payment_present_value(
-        coupon_rate_annual: float,
-        interest_rate: float,
-        compounding_frequency_yr: int,
-        years_to_maturity: int,
-    ):
-        """
-        Calculate the present value of the coupon payments of a bond.
-
-        Args:
-            coupon_rate_annual: float
-                The annual coupon rate of the bond.
-            face_value: int
-                The face value of the bond.
-            interest_rate: float
-                The yield rate of the bond.
-            compounding_frequency_yr: int
-                The frequency at which the yield is compounded.
-            years_to_maturity: int
-                The number of years until the bond matures.
-
-        Returns:
-            payment_value: float
-                The present value of the coupon payments of the bond.
-        """
-
-        coupon_rate_adjusted = coupon_rate_annual / compounding_frequency_yr
-
-        numerator = 1 - interest.discrete_compound_interest_discounted(
-            interest_rate, years_to_maturity, compounding_frequency_yr
-        )
+    # Single bond case of the broadcasting pricer, so the closed form lives in one place
+    price = float(price_coupon_bearing_bond_discrete_vectorised(
+        face_value, years_to_maturity, coupon_rate, interest_rate, compounding_frequency_yr
+    ))
 
-        denominator = interest_rate / compounding_frequency_yr
+    return price
 
-        payment_value = coupon_rate_adjusted * (numerator / denominator)
 
-        return payment_value
+def price_coupon_bearing_bond_discrete_vectorised(
+    face_value: np.ndarray,
+    years_to_maturity: np.ndarray,
+    coupon_rate: np.ndarray,
+    interest_rate: np.ndarray,
+    compounding_frequency_yr: int,
+) -> np.ndarray:
+    """
+    Calculate the prices of many coupon bearing bonds using discrete compound interest.
+    Uses a closed form annuity, so each bond costs O(1) regardless of its maturity.
+    The inputs follow numpy broadcasting.
 
-    # Initialise the price
-    price = 0
+    Args:
+        face_value: np.ndarray
+            The face values of the bonds.
+        years_to_maturity: np.ndarray
+            The number of years until each bond matures.
+        coupon_rate: np.ndarray
+            The annual coupon rates of the bonds.
+        interest_rate: np.ndarray
+            The yield rates of the bonds.
+        compounding_frequency_yr: int
+            The frequency at which the yield is compounded.
 
-    # Calculate the annual coupon payment
-    coupon_rate_annual = coupon_rate * face_value
+    Returns:
+        prices: np.ndarray
+            The prices of the bonds.
+    """
 
-    # Add the present value of the coupon payments
-    coupon_value = coupon_payment_present_value(
-        coupon_rate_annual, interest_rate, compounding_frequency_yr, years_to_maturity
-    )
-    price += coupon_value
+    face_value = np.asarray(face_value, dtype=np.float64)
+    rate = np.asarray(interest_rate, dtype=np.float64) / compounding_frequency_yr
+    num_periods = np.asarray(years_to_maturity, dtype=np.float64) * compounding_frequency_yr
 
-    # Add the face value discounted to the present
-    discounted_face_value = price_zero_coupon_bond_discrete(
-        face_value, years_to_maturity, interest_rate, compounding_frequency_yr
-    )
-    price += discounted_face_value
+    # Log of the discount factor (1 + rate)^(-num_periods), shared by the coupon
+    # annuity and the face value so the power is only taken once
+    log_beta = -num_periods * np.log1p(rate)
 
-    return price
+    # Calculate the periodic coupon payment
+    coupon_payment = np.asarray(coupon_rate, dtype=np.float64) * face_value / compounding_frequency_yr
+
+    # Present value of the coupon payments. The annuity factor (1 - beta) / rate
+    # is computed via expm1 to avoid cancellation for small rates
+    annuity_factor = -np.expm1(log_beta) / rate
+
+    # Coupon annuity plus the face value discounted to the present
+    prices = coupon_payment * annuity_factor + face_value * np.exp(log_beta)
+
+    return prices
 
 
 def adjusted_coupon_rate(coupon_rate: float, compounding_frequency_yr: int) -> float:
@@ -239,6 +243,7 @@ def present_value_coupon_bearing_bond_discrete(
     coupon_rate: float,
     interest_rate: float,
     compounding_frequency_yr: int,
+    checks: bool = True,
 ) -> float:
     """
     Calculate the present value of the coupon payments of a bond at a specific time step.
@@ -262,8 +267,9 @@ def present_value_coupon_bearing_bond_discrete(
             The present value of the coupon payments of the bond at the specified time step.
     """
 
-    if time_step < 1:
-        raise ValueError("Time step must be greater than or equal to 1.")
+    if checks:
+        if time_step < 1:
+            raise ValueError("Time step must be greater than or equal to 1.")
 
     num_time_steps = years_to_maturity * compounding_frequency_yr
 
@@ -308,21 +314,23 @@ def present_values_coupon_bearing_bond_discrete(
             The present values of the coupon payments of the bond at each time step.
     """
 
-    num_time_steps = years_to_maturity * compounding_frequency_yr
+    num_time_steps = int(years_to_maturity * compounding_frequency_yr)
 
-    present_values = [
-        present_value_coupon_bearing_bond_discrete(
-            time_step,
-            face_value,
-            years_to_maturity,
-            coupon_rate,
-            interest_rate,
-            compounding_frequency_yr,
-        )
-        for time_step in range(1, num_time_steps + 1)
-    ]
+    # Every time step pays a coupon, the last also repays the face value
+    cashflows = np.full(
+        num_time_steps, coupon_value(face_value, coupon_rate, compounding_frequency_yr)
+    )
+    # Slice so a bond with no time steps is left empty rather than raising
+    cashflows[-1:] += face_value
+
+    betas = interest.discrete_compound_interest_discount_factors(
+        interest_rate, num_time_steps, compounding_frequency_yr
+    )
 
-    return present_values
+    # Discount the cashflows in place rather than allocating another array
+    present_values = np.multiply(cashflows, betas, out=cashflows)
+
+    return present_values.tolist()
 
 
 def bond_duration_discrete(
@@ -331,6 +339,7 @@ def bond_duration_discrete(
     coupon_rate: float,
     interest_rate: float,
     compounding_frequency_yr: int,
+    method: str = "closed_form",
 ) -> float:
     """
     Calculate the duration of a bond with discrete interest.
@@ -346,39 +355,45 @@ def bond_duration_discrete(
             The yield rate of the bond.
         compounding_frequency_yr: int
             The frequency at which the yield is compounded.
+        method: str
+            "closed_form" for the O(1) Macaulay duration formula or "sum" to weight
+            the present value of every cashflow explicitly.
 
     Returns:
         duration: float
             The duration of the bond.
     """
 
-    duration = 0
+    if method not in ("closed_form", "sum"):
+        raise ValueError('Method must be either "closed_form" or "sum".')
 
-    num_time_steps = years_to_maturity * compounding_frequency_yr
+    if method == "closed_form" and interest_rate != 0:
+        # Per period yield and coupon rate
+        y = interest_rate / compounding_frequency_yr
+        c = coupon_rate / compounding_frequency_yr
+        num_periods = years_to_maturity * compounding_frequency_yr
 
-    B = sum(
-        present_values_coupon_bearing_bond_discrete(
-            face_value,
-            years_to_maturity,
-            coupon_rate,
-            interest_rate,
-            compounding_frequency_yr,
-        )
-    )
+        # (1 + y)^N - 1
+        growth = math.expm1(num_periods * math.log1p(y))
 
-    for time_step in range(1, num_time_steps + 1):
-        year = time_step / compounding_frequency_yr
+        duration_periods = (1 + y) / y - (1 + y + num_periods * (c - y)) / (c * growth + y)
 
-        present_value_t = present_value_coupon_bearing_bond_discrete(
-            time_step,
-            face_value,
-            years_to_maturity,
-            coupon_rate,
-            interest_rate,
-            compounding_frequency_yr,
-        )
+        return duration_periods / compounding_frequency_yr
+
+    present_values = np.asarray(present_values_coupon_bearing_bond_discrete(
+        face_value,
+        years_to_maturity,
+        coupon_rate,
+        interest_rate,
+        compounding_frequency_yr,
+    ))
+
+    B = present_values.sum()
 
-        duration += (year * present_value_t) / B
+    # Time in years of each time step
+    years = np.arange(1, len(present_values) + 1) / compounding_frequency_yr
+
+    duration = float(np.dot(years, present_values) / B)
 
     return duration
 
@@ -390,6 +405,8 @@ def bond_value_at_time(
     coupon_rate: float,
     interest_rate: float,
     compounding_frequency_yr: int,
+    verbose: bool = False,
+    checks: bool = True,
 ) -> float:
     """
     Calculates the value of a bond at a specific time.
@@ -407,57 +424,56 @@ def bond_value_at_time(
             The yield rate of the bond.
         compounding_frequency_yr: int
             The frequency at which the yield is compounded.
+        verbose: bool
+            Whether to print the reinvestment value of each cashflow.
 
     Returns:
         bond_value: float
             The value of the bond at the specified time.
     """
 
-    if bond_duration < 0 or bond_duration > years_to_maturity:
-        raise ValueError("Bond duration must be in the range [0, years_to_maturity].")
+    if checks:
+        if bond_duration < 0 or bond_duration > years_to_maturity:
+            raise ValueError("Bond duration must be in the range [0, years_to_maturity].")
 
-    if compounding_frequency_yr < 1:
-        raise ValueError("Compounding frequency must be a positive integer.")
+        if compounding_frequency_yr < 1:
+            raise ValueError("Compounding frequency must be a positive integer.")
 
-    if interest_rate < 0 or interest_rate > 1:
-        raise ValueError("Interest rate must be in the range [0, 1].")
+        if interest_rate < 0 or interest_rate > 1:
+            raise ValueError("Interest rate must be in the range [0, 1].")
 
-    num_time_steps = years_to_maturity * compounding_frequency_yr
+    num_time_steps = int(years_to_maturity * compounding_frequency_yr)
 
-    # interest_adjusted = 1 + interest_rate
     coup_val = coupon_value(face_value, coupon_rate, compounding_frequency_yr)
-    bond_value = 0
-
-    # Coupons
-
-    reinvestments = []
-
-    for time_step in range(1, num_time_steps + 1):
-        year = time_step / compounding_frequency_yr
-
-        # Length of time this coupon can be reinvested for
-        reinvestment_time = bond_duration - year
-
-        cashflow = coup_val
-        if time_step == num_time_steps:
-            # Last coupon includes face value
-            cashflow += float(face_value)
-
-        beta = interest.discrete_compound_interest_accumulated_bond(
-            interest_rate, reinvestment_time, compounding_frequency_yr
-        )
-        coupon_reinvestment_val = cashflow * beta
-
-        print(
-            f"Time step {time_step:<1}, Year {year:<1}, Cashflow: {cashflow:>8}, Beta:"
-            + f"{beta:>8.4f}, Reinvestment value {coupon_reinvestment_val:>9.4f}"
-        )
 
-        reinvestments.append(coupon_reinvestment_val)
+    # Every time step pays a coupon, the last also repays the face value
+    cashflows = np.full(num_time_steps, coup_val)
+    # Slice so a bond with no time steps is left empty rather than raising
+    cashflows[-1:] += face_value
+
+    # Each coupon is reinvested for bond_duration - year, giving the accumulation factor
+    # base^(bond_duration - time_step / m) = base^bond_duration * (base^(-1 / m))^time_step.
+    # Factoring out base^bond_duration leaves a running product over the time steps
+    base = 1 + interest_rate / compounding_frequency_yr
+    step = base ** (-1 / compounding_frequency_yr)
+
+    betas = base ** bond_duration * np.cumprod(np.full(num_time_steps, step))
+    reinvestment_values = cashflows * betas
+
+    if verbose:
+        years = np.arange(1, num_time_steps + 1) / compounding_frequency_yr
+
+        for time_step in range(1, num_time_steps + 1):
+            print(
+                f"Time step {time_step:<1}, Year {years[time_step - 1]:<1}, "
+                + f"Cashflow: {cashflows[time_step - 1]:>8}, Beta:"
+                + f"{betas[time_step - 1]:>8.4f}, Reinvestment value "
+                + f"{reinvestment_values[time_step - 1]:>9.4f}"
+            )
 
-    print("-" * 50)
+        print("-" * 50)
 
-    bond_value = sum(reinvestments)
+    bond_value = float(reinvestment_values.sum())
 
     return bond_value
 
@@ -496,6 +512,8 @@ def spot_zero_coupon_yield_curve_continuous(
             The spot yield curve for the bond.
     """
 
+    rates = np.asarray(spot_rates, dtype=np.float64)
+
     # Checks
     if checks:
         if years_to_maturity < 0:
@@ -504,7 +522,7 @@ def spot_zero_coupon_yield_curve_continuous(
         if compounding_frequency_yr < 1:
             raise ValueError("Compounding frequency must be a positive integer.")
 
-        if any(rate < 0 for rate in spot_rates):
+        if np.any(rates < 0):
             raise ValueError("Spot rates must be non-negative.")
 
         if coupon_rate < 0 or coupon_rate > 1:
@@ -522,14 +540,12 @@ def spot_zero_coupon_yield_curve_continuous(
     c_f = coup_val + face_value
     k_1 = num_time_steps - 1
 
-    discount_sum = 0
-    for time_step in range(1, k_1 + 1):
-        year = time_step / compounding_frequency_yr
-        spot_rate = spot_rates[time_step - 1]
+    if len(rates) < k_1:
+        raise ValueError("A spot rate is required for every time step before maturity.")
 
-        discount_sum += interest.continuous_compound_interest_discounted(
-            spot_rate, year
-        )
+    # Discount every time step before maturity at its own spot rate in one pass
+    years = np.arange(1, k_1 + 1) / compounding_frequency_yr
+    discount_sum = float(np.exp(-rates[:k_1] * years).sum())
 
     spot_yield = (compounding_frequency_yr / num_time_steps) * math.log(
         (c_f) / (present_value - coup_val * discount_sum)
@@ -546,7 +562,8 @@ def forward_rate_continuous(
     checks: bool = True,
 ) -> float:
     """
-    Calculate the forward rate between two time periods.
+    Calculate the forward rate between two time periods. Accepts numpy arrays,
+    in which case the forward rates are computed elementwise.
 
     Args:
         time_j: float
@@ -564,16 +581,16 @@ def forward_rate_continuous(
     """
 
     if checks:
-        if time_k < 0 or time_j < 0:
+        if np.any(time_k < 0) or np.any(time_j < 0):
             raise ValueError("Time periods must be non-negative.")
 
-        if time_j > time_k:
+        if np.any(time_j > time_k):
             raise ValueError("Time period j must be before time period k.")
 
-        if spot_rate_0_j < 0 or spot_rate_0_k < 0:
+        if np.any(spot_rate_0_j < 0) or np.any(spot_rate_0_k < 0):
             raise ValueError("Spot rates must be non-negative.")
 
-        if spot_rate_0_j > spot_rate_0_k:
+        if np.any(spot_rate_0_j > spot_rate_0_k):
             raise ValueError(
                 "Spot rate at time period j must be less than spot rate at time period k. "
                 + "This would otherwise cause a negative forward rate!"
@@ -630,39 +647,40 @@ def recursive_zero_coupon_yield_continuous(
         if face_value < 0:
             raise ValueError("Face value must be non-negative.")
 
+        if coupon_rate < 0 or coupon_rate > 1:
+            raise ValueError("Coupon rate must be in the range [0, 1].")
+
+        if any(period < 0 for period in maturity_periods):
+            raise ValueError("Years to maturity must be non-negative.")
+
     # Bond 1 can be seen as a zero-coupon bond with face value F + C
     # Since it has no coupons, it's yield is the same as the spot rate.
     # For the remaining bonds, we can calculate the spot rate and forward rate
     # with the current and previous bonds' spot rates.
 
+    spot_rates = _bootstrap_spot_rates(
+        coupon_bond_prices,
+        face_value,
+        maturity_periods,
+        coupon_rate,
+        compounding_frequency_yr,
+        checks,
+    )
+
     forward_rates = []
-    spot_rates = []
 
-    for k, bond_price in enumerate(coupon_bond_prices, start=1):
+    for k, y_0_k in enumerate(spot_rates, start=1):
         years_to_maturity = maturity_periods[k - 1]
         prev_period = maturity_periods[k - 2] if k > 1 else 0
 
-        # Calculate the spot rate for the bond
-        y_0_k = spot_zero_coupon_yield_curve_continuous(
-            face_value,
-            bond_price,
-            years_to_maturity,
-            spot_rates,
-            coupon_rate,
-            compounding_frequency_yr,
-        )
-
-        spot_rates.append(y_0_k)
-
         if k > 1:
             # Calculate the forward rate for the bond
-            prev_spot_rate = spot_rates[-2]
-            current_spot_rate = spot_rates[-1]
+            prev_spot_rate = spot_rates[k - 2]
             y_k_1_k = forward_rate_continuous(
                 prev_period,
                 years_to_maturity,
                 prev_spot_rate,
-                current_spot_rate,
+                y_0_k,
                 checks=False,
             )
 
@@ -674,6 +692,85 @@ def recursive_zero_coupon_yield_continuous(
     return spot_rates, forward_rates
 
 
+def _bootstrap_spot_rates(
+    coupon_bond_prices: list[float],
+    face_value: int,
+    maturity_periods: list[int],
+    coupon_rate: float,
+    compounding_frequency_yr: int,
+    checks: bool = True,
+) -> list[float]:
+    """
+    Bootstraps the spot rates of coupon bearing bonds. This is the same computation as calling
+    spot_zero_coupon_yield_curve_continuous for each bond, but with the coupon value hoisted
+    out of the loop and the discount sum carried over from one bond to the next.
+    The inputs are validated by the caller; only the checks that depend on the rates
+    found so far are made here.
+
+    Args:
+        coupon_bond_prices: list[float]
+            The prices of the coupon bearing bonds.
+        face_value: int
+            The face value of the bond.
+        maturity_periods: list[int]
+            The number of periods until the bond matures.
+        coupon_rate: float
+            The annual coupon rate of the bond.
+        compounding_frequency_yr: int
+            The frequency at which the yield is compounded.
+        checks: bool
+            Whether to check that each bond gives a valid, non-negative spot rate.
+
+    Returns:
+        spot_rates: list[float]
+            The spot rates of the bonds.
+    """
+
+    coup_val = coupon_value(face_value, coupon_rate, compounding_frequency_yr)
+    c_f = coup_val + face_value
+
+    num_bonds = len(coupon_bond_prices)
+    spot_rates = [0.0] * num_bonds
+
+    # Running sum of the discount factors for time steps 1 to num_discounted. Each bond
+    # only needs the terms for time steps before its maturity, so with increasing
+    # maturities every discount factor is evaluated once.
+    discount_sum = 0
+    num_discounted = 0
+
+    for k in range(num_bonds):
+        num_time_steps = int(maturity_periods[k] * compounding_frequency_yr)
+
+        if num_time_steps - 1 > k:
+            raise ValueError("A spot rate is required for every time step before maturity.")
+
+        if num_discounted > num_time_steps - 1:
+            # Maturities are not increasing, rebuild the sum from the first time step
+            discount_sum = 0
+            num_discounted = 0
+
+        while num_discounted < num_time_steps - 1:
+            num_discounted += 1
+            year = num_discounted / compounding_frequency_yr
+            discount_sum += math.exp(-spot_rates[num_discounted - 1] * year)
+
+        # Price left for the final cashflow once the earlier coupons are discounted
+        residual_value = coupon_bond_prices[k] - coup_val * discount_sum
+
+        if checks and residual_value <= 0:
+            raise ValueError(
+                "Present value must exceed the discounted coupons before maturity.")
+
+        spot_rates[k] = (compounding_frequency_yr / num_time_steps) * math.log(
+            c_f / residual_value
+        )
+
+        if checks and spot_rates[k] < 0:
+            raise ValueError("Spot rates must be non-negative.")
+
+    return spot_rates
+
+
 def price_zero_coupon_bond(
     forward_rate: float, up_rate: float, down_rate: float, up_pr: float, down_pr: float
 ) -> float:
@@ -681,6 +778,7 @@ def price_zero_coupon_bond(
     Computes the price of a zero coupon bond with F = $1
     given a forward rate assuming a binomial model where the forward rate
     can move up or down as specified with probabilities p and q.
+    The rates may be numpy arrays to price every node of a lattice level at once.
 
     Args:
         forward_rate: float
@@ -710,9 +808,33 @@ def price_zero_coupon_bond(
     return p_price
 
 
-def spot_rate_from_present_rate(present_rate: float, end_time: float) -> float:
+def price_zero_coupon_bond_leaf(forward_rate: float) -> float:
     """
-    Computes the spot rate from the present rate, P_{0,n}
+    Computes the price of a zero coupon bond with F = $1 maturing one period after
+    a lattice node with the given forward rate. Both children of the node pay $1,
+    so this is price_zero_coupon_bond with up and down rates of 1. Accepts numpy
+    arrays to price every node of a lattice level at once.
+
+    Args:
+        forward_rate: float
+            The forward rate at the node.
+
+    Returns:
+        p_price: float
+            The price of the zero coupon bond, i.e. p{.,.}.
+    """
+
+    p_price = 1 / (1 + forward_rate)
+
+    return p_price
+
+
+def spot_rate_from_present_rate(
+    present_rate: float, end_time: float, checks: bool = True
+) -> float:
+    """
+    Computes the spot rate from the present rate, P_{0,n}. Accepts numpy arrays,
+    in which case the spot rates are computed elementwise.
 
     Args:
         present_rate: float
@@ -725,15 +847,16 @@ def spot_rate_from_present_rate(present_rate: float, end_time: float) -> float:
             The spot rate, y_{0,n}.
     """
 
-    if present_rate <= 0:
-        raise ValueError("Present rate must be strictly positive.")
-
-    if end_time <= 0:
-        raise ValueError("End time must be strictly positive.")
+    if checks:
+        if np.any(present_rate <= 0):
+            raise ValueError("Present rate must be strictly positive.")
 
-    fraction = 1 / present_rate
+        if np.any(end_time <= 0):
+            raise ValueError("End time must be strictly positive.")
 
-    return fraction ** (1 / end_time) - 1
+    # (1 / P)^(1 / n) - 1 evaluated as expm1(-log(P) / n) which keeps full precision
+    # when the spot rate is small
+    return np.expm1(-np.log(present_rate) / end_time)
 
 
 def spot_rate_from_p_lattice(p_lattice: BinLattice) -> float:
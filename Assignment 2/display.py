@@ -2,9 +2,17 @@
 Helper for dislaying things on the screen
 """
 
+import sys
 from colorama import Fore, Style
 from IPython.display import Markdown, display
 
+# Only emit colour codes when writing to a terminal
+USE_COLOUR = sys.stdout.isatty()
+
+BLUE = Fore.BLUE if USE_COLOUR else ""
+GREEN = Fore.GREEN if USE_COLOUR else ""
+RESET = Style.RESET_ALL if USE_COLOUR else ""
+
 
 def display_question(question_number: int, question_text: str):
     """
@@ -17,7 +25,7 @@ def display_question(question_number: int, question_text: str):
             The text of the question.
     """
 
-    print(f"{Fore.BLUE}Question {question_number}:{Style.RESET_ALL}")
+    print(f"{BLUE}Question {question_number}:{RESET}")
     print(question_text)
 
 
@@ -32,8 +40,11 @@ def display_answer(
             The value of the answer.
     """
 
-    print(f"{Fore.GREEN}Answer:{Style.RESET_ALL}", end=" ")
-    print(f'{"$" if dollar_value else ""}{round(answer_value, decimal_places)}')
+    # Write the whole line at once rather than across two print calls
+    sys.stdout.write(
+        f"{GREEN}Answer:{RESET} "
+        + f'{"$" if dollar_value else ""}{round(answer_value, decimal_places)}\n'
+    )
 
 
 def printmd(string):
@@ -4,7 +4,7 @@ for binomial interest rate model
 """
 
 from typing import List, Union
-from colorama import Fore, Style
+import numpy as np
 
 import bond
 
@@ -14,6 +14,8 @@ class Node:
     Defines a node in a lattice
     """
 
+    __slots__ = ("value", "depth", "children")
+
     def __init__(self, value: float, depth: int, children: list["Node"]) -> None:
         """
         Initialise a node with a value and children
@@ -49,6 +51,8 @@ class Node:
 
 
 class BinNode(Node):
+    __slots__ = ("parent", "up", "down")
+
     def __init__(
         self,
         value: float,
@@ -88,26 +92,27 @@ class BinNode(Node):
             # Set the parent of the down node to be this node
             down.set_parent(self)
 
-    def __eq__(self, other: "BinNode") -> bool:
+    def is_close(self, other: "BinNode", tolerance: float = 1e-12) -> bool:
+        """
+        Check if another node is at the same depth with a value within a tolerance.
+        Nodes otherwise compare by identity.
+
+        Args:
+            other: the node to compare against
+            tolerance: the largest absolute difference in value to accept
+
+        Returns:
+            True if the nodes match, False otherwise
+        """
+
         if other is None:
             return False
 
-        return self.value == other.value and self.depth == other.depth
+        return self.depth == other.depth and abs(self.value - other.value) <= tolerance
 
     def __repr__(self) -> str:
         return f"{self.value:.5f}"
 
-    def __copy__(self) -> "BinNode":
-        node_value_copy = self.value
-        node_depth_copy = self.depth
-        node_up_copy = self.up.__copy__() if self.up is not None else None
-        node_down_copy = self.down.__copy__() if self.down is not None else None
-
-        node_copy = BinNode(
-            node_value_copy, node_depth_copy, None, node_up_copy, node_down_copy)
-
-        return node_copy
-
     def get_parent(self) -> Union["BinNode", None]:
         return self.parent
 
@@ -133,40 +138,44 @@ class BinNode(Node):
             self.down = None
 
     def set_up(self, up: "BinNode") -> None:
-        if self.up is not None:
-            # Need to remove the old up node from the children
-
-            try:
-                self.children.remove(self.up)
-            except ValueError:
-                print(f"{Fore.RED}Error: up node not in children{Style.RESET_ALL}")
+        self.set_up_down(up, self.down)
 
-        self.up = up
+    def set_down(self, down: "BinNode") -> None:
+        self.set_up_down(self.up, down)
 
-        # Add the new up node to the children
-        self.children.append(up)
+    def set_up_down(self, up: "BinNode", down: "BinNode") -> None:
+        """
+        Set both children of the node at once. The children list is rebuilt as
+        [up, down] rather than searching it for the old children.
 
-    def set_down(self, down: "BinNode") -> None:
-        if self.down is not None:
-            # Need to remove the old down node from the children
+        Args:
+            up: the up child of the node
+            down: the down child of the node
 
-            try:
-                self.children.remove(self.down)
-            except ValueError:
-                print(f"{Fore.RED}Error: down node not in children{Style.RESET_ALL}")
+        Returns:
+            None
+        """
 
+        self.up = up
         self.down = down
 
-        # Add the new down node to the children
-        self.children.append(down)
+        self.children = [up, down]
 
 
 class BinLattice:
-    def __init__(self, head_node: BinNode, depth: int = 0) -> None:
-        self.head_node = head_node
+    """
+    Recombining binomial lattice. An up move followed by a down move reaches the same
+    node as a down move followed by an up move, so depth d has d + 1 nodes. The node
+    values are stored in a triangular array where values[d, j] is the node at depth d
+    reached by j up moves. BinNode objects are created on request from these values.
+    """
 
+    def __init__(self, head_node: BinNode, depth: int = 0) -> None:
         self.depth = depth
 
+        self.values = np.zeros((depth + 1, depth + 1), dtype=np.float64)
+        self.values[0, 0] = head_node.get_value()
+
         # generate dummy bin node to compute the length of it's string representation
         # to determine the spacing between nodes
 
@@ -181,7 +190,7 @@ class BinLattice:
         self.down_factor = None
 
     def get_head_node(self) -> BinNode:
-        return self.head_node
+        return BinNode(self.values[0, 0], 0, None, None, None)
 
     def get_depth(self) -> int:
         """
@@ -201,34 +210,30 @@ class BinLattice:
             depth: the depth to get the nodes at, indexed from 0
 
         Returns:
-            A list of nodes at the specified depth
+            A list of nodes at the specified depth, ordered by the number of up moves
         """
 
-        nodes = [self.head_node]
+        return [BinNode(value, depth, None, None, None) for value in self.level_values(depth).tolist()]
 
-        if depth == 0:
-            return nodes
-
-        for d in range(depth):
-            new_nodes = []
-            for node in nodes:
-                down_child = node.get_down()
-                up_child = node.get_up()
-
-                if down_child is not None and down_child not in new_nodes:
-                    new_nodes.append(down_child)
+    def level_values(self, depth: int) -> np.ndarray:
+        """
+        Get the values of all nodes at a certain depth
 
-                if up_child is not None and up_child not in new_nodes:
-                    new_nodes.append(up_child)
+        Args:
+            depth: the depth to get the values at, indexed from 0
 
-            nodes = new_nodes
+        Returns:
+            The node values at the specified depth, ordered as in get_nodes_at_depth.
+            This is a view into the lattice.
+        """
 
-        return nodes
+        return self.values[depth, :depth + 1]
 
     @staticmethod
     def get_num_nodes_at_depth(depth: int) -> int:
         """
-        Get the number of nodes at a certain depth
+        Get the number of nodes at a certain depth. The lattice recombines, so this
+        is depth + 1 rather than the 2 ** depth paths that reach that depth.
 
         Args:
             depth: the depth to get the number of nodes at, indexed from 0
@@ -237,7 +242,7 @@ class BinLattice:
             The number of nodes at the specified depth
         """
 
-        return 2 ** depth
+        return depth + 1
 
     def construct_bin_lattice(
         self, up_factor: float, down_factor: float, depth: int
@@ -254,33 +259,26 @@ class BinLattice:
             None
         """
 
+        head_value = self.values[0, 0]
+
         self.depth = depth
         self.up_factor = up_factor
         self.down_factor = down_factor
 
-        current_level_nodes = [self.head_node]
-
-        for i in range(depth + 1):
-            if i == depth:
-                # If we are at the last level, we don't need to create any children
-                break
-
-            next_level_nodes = []
+        # values[i, j] = head * u^j * d^(i - j) for j <= i, built in one pass from
+        # tables of the powers of each factor
+        exponents = np.arange(depth + 1)
+        up_powers = np.cumprod(np.concatenate(([1.0], np.full(depth, up_factor))))
+        down_powers = np.cumprod(np.concatenate(([1.0], np.full(depth, down_factor))))
 
-            for parent_node in current_level_nodes:
-                down_value = parent_node.get_value() * down_factor
-                up_value = parent_node.get_value() * up_factor
+        num_down = exponents[:, None] - exponents[None, :]
+        below_diagonal = num_down >= 0
 
-                down_node = BinNode(down_value, i + 1, parent_node, None, None)
-                up_node = BinNode(up_value, i + 1, parent_node, None, None)
-
-                parent_node.set_down(down_node)
-                parent_node.set_up(up_node)
-
-                next_level_nodes += [down_node, up_node]
-
-            # Reset the current level nodes to the next level nodes
-            current_level_nodes = next_level_nodes
+        self.values = np.where(
+            below_diagonal,
+            head_value * up_powers[None, :] * down_powers[np.where(below_diagonal, num_down, 0)],
+            0.0,
+        )
 
     def check_path(self, path: Union[str, list[str]]) -> bool:
         """
@@ -293,11 +291,8 @@ class BinLattice:
             True if the path is valid, False otherwise
         """
 
-        for step in path:
-            if step not in ["u", "d"]:
-                return False
-
-        return True
+        # Works for both strings and lists as each counts whole 'u' and 'd' steps
+        return path.count("u") + path.count("d") == len(path)
 
     def get_node_by_path(self, path: Union[str, list[str]]) -> BinNode:
         """
@@ -311,20 +306,16 @@ class BinLattice:
             The forward rate at the end of the path as BinNode
         """
 
-        # Check path
-        if not self.check_path(path):
-            print(f"{Fore.RED}Invalid path{Style.RESET_ALL}")
-            return 0.0
+        depth = len(path)
 
-        current_node = self.head_node
+        # In a recombining lattice the node only depends on the number of up moves
+        num_up = path.count("u")
 
-        for step in path:
-            if step == "u":
-                current_node = current_node.get_up()
-            else:
-                current_node = current_node.get_down()
+        # Check path
+        if num_up + path.count("d") != depth or depth > self.depth:
+            raise ValueError(f"Invalid path {path}. Paths must be at most {self.depth} 'u' or 'd' steps.")
 
-        return current_node
+        return BinNode(self.values[depth, num_up], depth, None, None, None)
 
     def spot_rate_from_path(self, path: Union[str, list[str]]) -> float:
         """
@@ -341,6 +332,24 @@ class BinLattice:
 
         return bond.price_zero_coupon_bond_leaf(node.get_value())
 
+    def spot_rates_at_depth(self, depth: int) -> np.ndarray:
+        """
+        Computes the price, P of a zero coupon bond maturing one period after every
+        node at a certain depth. Equivalent to spot_rate_from_path for every path of
+        length depth, but prices the d + 1 distinct nodes in one call.
+
+        Args:
+            depth: the depth of the nodes, indexed from 0
+
+        Returns:
+            The prices of the zero coupon bonds, ordered by the number of up moves
+        """
+
+        if depth < 0 or depth > self.depth:
+            raise ValueError(f"Invalid depth {depth}. Depth must be in the range [0, {self.depth}].")
+
+        return bond.price_zero_coupon_bond_leaf(self.level_values(depth))
+
     def get_lattice_subtree(self, depth: int) -> "BinLattice":
         """
         Gets a subtree of the lattice with a certain depth
@@ -353,16 +362,13 @@ class BinLattice:
         """
 
         if depth < 0 or depth > self.depth:
-            print(
-                f"{Fore.RED}Invalid depth. Depth must be in the range [0, {self.depth}].{Style.RESET_ALL}")
-            return None
+            raise ValueError(f"Invalid depth {depth}. Depth must be in the range [0, {self.depth}].")
 
-        # Create copy of tree
-        lattice_copy = BinLattice(self.head_node)
-
-        # Recreate the lattice up to the specified depth
-        lattice_copy.construct_bin_lattice(
-            self.up_factor, self.down_factor, depth)
+        # Copy the levels up to the specified depth rather than recreating them
+        lattice_copy = BinLattice(self.get_head_node(), depth=depth)
+        lattice_copy.values = self.values[:depth + 1, :depth + 1].copy()
+        lattice_copy.up_factor = self.up_factor
+        lattice_copy.down_factor = self.down_factor
 
         return lattice_copy
 
@@ -385,67 +391,80 @@ class BinLattice:
             A new lattice with P values
         """
 
-        if future_time_period < 0 or future_time_period > self.depth:
-            print(
-                f"{Fore.RED}Invalid forward time period. Forward time period must be in the range [0, {self.depth}].{Style.RESET_ALL}")
-            return None
+        if future_time_period < 1 or future_time_period > self.depth:
+            raise ValueError(
+                f"Invalid forward time period {future_time_period}. "
+                + f"Forward time period must be in the range [1, {self.depth}].")
 
-        # Get subtree of the lattice up to the forward time period
         leaf = future_time_period - 1
-        lattice_subtree = self.get_lattice_subtree(leaf)
 
-        # Construct new lattice bottom up just by replacing the values of the nodes
-        # as we go
+        # Construct new lattice bottom up from the forward rates up to the leaf
+        p_lattice = BinLattice(self.get_head_node(), depth=leaf)
 
-        # First take a copy of the subtree
-        p_lattice = lattice_subtree.__copy__()
-        # At this stage the lattice is still the forward lattice and
-        # below it will be converted to the p lattice
+        # All 1s below the leaves of the p lattice
+        p_values = np.ones(leaf + 2, dtype=np.float64)
 
-        depth = leaf
+        # The P value of each node is the discounted expected value of its two children,
+        # so a whole level is one vector operation on the level below it
+        for depth in range(leaf, -1, -1):
+            p_values = bond.price_zero_coupon_bond(
+                self.level_values(depth), p_values[1:], p_values[:-1], up_pr, down_pr)
 
-        while depth >= 0:
-            if depth == leaf:
-                # Leaf case
-                # All 1s for the first level of the p lattice
-                leaf_num_nodes = BinLattice.get_num_nodes_at_depth(depth+1)
-                p_lattice_prev_level_nodes = [
-                    BinNode(1, leaf, None, None, None) for _ in range(leaf_num_nodes)]
-            else:
-                # Recursive case
-                # Get the previous level of the p lattice
-                p_lattice_prev_level_nodes = p_lattice.get_nodes_at_depth(
-                    depth + 1)
+            p_lattice.values[depth, :depth + 1] = p_values
 
-            # Get nodes at current level from forward lattice
-            forward_lattice_nodes = lattice_subtree.get_nodes_at_depth(depth)
+        return p_lattice
 
-            for i, forward_node in enumerate(forward_lattice_nodes):
-                forward_rate = forward_node.get_value()
+    def construct_p_lattice_batch(
+        self, future_time_period: int, up_prs: np.ndarray, down_prs: np.ndarray
+    ) -> np.ndarray:
+        """
+        Computes the head node P_{0, future_time_period} of the p lattice for many pairs
+        of up and down probabilities at once. Every pair runs the same backward
+        induction, so the pairs are stacked along a leading axis and each level is
+        priced for all of them in one vector operation.
 
-                # zero coupon bond price is the expected value of the two child nodes
-                p_down_node = p_lattice_prev_level_nodes[i]
-                p_up_node = p_lattice_prev_level_nodes[i + 1]
+        Args:
+            future_time_period: int
+                The upper bound / period to construct the zero spot lattice for
+            up_prs: np.ndarray
+                The probabilities of an up move within the binomial model. May be a scalar
+            down_prs: np.ndarray
+                The probabilities of a down move within the binomial model. May be a scalar
 
-                p_down_rate = p_down_node.get_value()
-                p_up_rate = p_up_node.get_value()
+        Returns:
+            The head node value of the p lattice for each pair of probabilities
+        """
 
-                bond_price = bond.price_zero_coupon_bond(
-                    forward_rate, p_up_rate, p_down_rate, up_pr, down_pr)
+        if future_time_period < 1 or future_time_period > self.depth:
+            raise ValueError(
+                f"Invalid forward time period {future_time_period}. "
+                + f"Forward time period must be in the range [1, {self.depth}].")
 
-                new_node = BinNode(bond_price, depth, None,
-                                   p_up_node, p_down_node)
+        up_prs = np.atleast_1d(np.asarray(up_prs, dtype=np.float64))
+        down_prs = np.atleast_1d(np.asarray(down_prs, dtype=np.float64))
 
-                # Update the p lattice with the newly computed node (p value)
-                p_lattice.set_node_at_depth_and_index(depth, i, new_node)
+        # A single probability is paired with every probability on the other side
+        if up_prs.ndim != 1 or down_prs.ndim != 1:
+            raise ValueError("Up and down probabilities must be scalars or 1D arrays.")
 
-            # Move to the next level up in the lattice
-            depth -= 1
+        if len(up_prs) != len(down_prs) and 1 not in (len(up_prs), len(down_prs)):
+            raise ValueError(
+                f"Got {len(up_prs)} up probabilities but {len(down_prs)} down probabilities.")
 
-        # At this point, new_nodes should contain only the head node
-        # of the new lattice
+        up_prs, down_prs = np.broadcast_arrays(up_prs, down_prs)
+        up_prs = up_prs[:, None]
+        down_prs = down_prs[:, None]
 
-        return p_lattice
+        leaf = future_time_period - 1
+
+        # All 1s below the leaves of every p lattice
+        p_values = np.ones((up_prs.shape[0], leaf + 2), dtype=np.float64)
+
+        for depth in range(leaf, -1, -1):
+            p_values = bond.price_zero_coupon_bond(
+                self.level_values(depth)[None, :], p_values[:, 1:], p_values[:, :-1], up_prs, down_prs)
+
+        return p_values[:, 0]
 
     def set_node_at_depth_and_index(self, depth: int, index: int, node: BinNode) -> None:
         """
@@ -461,28 +480,12 @@ class BinLattice:
         """
 
         if depth < 0 or depth > self.depth:
-            print(
-                f"{Fore.RED}Invalid depth. Depth must be in the range [0, {self.depth}].{Style.RESET_ALL}")
-            return
-
-        if index < 0 or index >= BinLattice.get_num_nodes_at_depth(depth):
-            print(
-                f"{Fore.RED}Invalid index. Index must be in the range [0, {BinLattice.get_num_nodes_at_depth(depth)}).{Style.RESET_ALL}")
-            return
-
-        nodes = self.get_nodes_at_depth(depth)
-
-        # Update this node's parent's children
-        parent = nodes[index].get_parent()
-        if parent is not None:
-            # Determine if this node is the up or down child of the parent
-            if parent.get_up() == nodes[index]:
-                parent.set_up(node)
-            else:
-                parent.set_down(node)
-        else:
-            # We are updating the head node
-            self.head_node = node
+            raise ValueError(f"Invalid depth {depth}. Depth must be in the range [0, {self.depth}].")
+
+        if index < 0 or index > depth:
+            raise ValueError(f"Invalid index {index}. Index must be in the range [0, {depth}].")
+
+        self.values[depth, index] = node.get_value()
 
     def __copy__(self) -> "BinLattice":
         """
@@ -492,9 +495,10 @@ class BinLattice:
             A copy of the lattice
         """
 
-        head_node_copy = self.head_node.__copy__()
-
-        lattice_copy = BinLattice(head_node_copy, depth=self.depth)
+        lattice_copy = BinLattice(self.get_head_node(), depth=self.depth)
+        lattice_copy.values = self.values.copy()
+        lattice_copy.up_factor = self.up_factor
+        lattice_copy.down_factor = self.down_factor
 
         return lattice_copy
 
@@ -534,22 +538,16 @@ class BinLattice:
             else:
                 return half_diff + len(self.separator)
 
-        lattice_str = ""
+        lines = []
 
         for level in range(self.depth + 1):
-            level_nodes = self.get_nodes_at_depth(level)
-            if len(level_nodes) == 0:
-                break
-            left_padding = compute_left_padding(self.depth, level)
-            lattice_str += " " * left_padding
-            lattice_str += self.separator
-            for node in level_nodes:
-                lattice_str += node.__repr__() + self.separator
-
-            lattice_str += " " * left_padding
-            lattice_str += "\n"
-
-        return lattice_str
+            padding = " " * compute_left_padding(self.depth, level)
+            node_strs = np.char.mod("%.5f", self.level_values(level))
+
+            lines.append(
+                padding + self.separator + self.separator.join(node_strs.tolist()) + self.separator + padding + "\n")
+
+        return "".join(lines)
 
 
 def main():
@@ -3,11 +3,54 @@ import swap
 from lattice import BinNode, BinLattice
 import table
 import display as dsp
-from IPython.display import Markdown, display, Latex
 from colorama import Fore, Style
 
 
-def bonds():
+# Prices of the 20 annual coupon bonds used to bootstrap the yield curve
+BOND_PRICES = [
+    99412,
+    97339,
+    94983,
+    94801,
+    94699,
+    94454,
+    93701,
+    93674,
+    93076,
+    92814,
+    91959,
+    91664,
+    87384,
+    87329,
+    86576,
+    84697,
+    82642,
+    82350,
+    82207,
+    81725,
+]
+
+
+def yield_curve():
+    """
+    Bootstrap the spot and forward rates from the bond prices.
+    Both bonds() and swaps() use this curve, so it is computed once in main().
+    """
+
+    num_bonds = len(BOND_PRICES)
+    F = 100_000
+    c = 0.04
+    n = 1  # annual
+    T = list(range(1, num_bonds + 1))
+
+    spot_rates, forward_rates = bond.recursive_zero_coupon_yield_continuous(
+        BOND_PRICES, F, T, c, n
+    )
+
+    return T, n, spot_rates, forward_rates
+
+
+def bonds(T_strip: list[int], spot_rates: list[float], forward_rates: list[float]):
     T = 3
     n = 2
     y = 0.09
@@ -29,48 +72,14 @@ def bonds():
 
     # Bond value at |D|
 
-    val_at_d = bond.bond_value_at_time(bond_duration, F, T, c, y, n)
+    val_at_d = bond.bond_value_at_time(bond_duration, F, T, c, y, n, verbose=True)
 
     print("The bond value at |D| is: ", val_at_d)
 
-    bond_prices = [
-        99412,
-        97339,
-        94983,
-        94801,
-        94699,
-        94454,
-        93701,
-        93674,
-        93076,
-        92814,
-        91959,
-        91664,
-        87384,
-        87329,
-        86576,
-        84697,
-        82642,
-        82350,
-        82207,
-        81725,
-    ]
-
-    num_bonds = 20
-    assert (len(bond_prices) == num_bonds)
-    F = 100_000
-    c = 0.04
-    n = 1  # annual
-    T = [k for k in range(1, num_bonds + 1)]
-
-    spot_rates, forward_rates = bond.recursive_zero_coupon_yield_continuous(
-        bond_prices, F, T, c, n
-    )
-
     table_data = []
 
-    for i in range(len(T)):
-        table_data.append([i, T[i], spot_rates[i], forward_rates[i]])
+    for i in range(len(T_strip)):
+        table_data.append([i, T_strip[i], spot_rates[i], forward_rates[i]])
 
     # Yet to put this into nice table
     col_heads = ["Time Step", "Year", "Spot Rate", "Forward Rate"]
@@ -83,42 +92,8 @@ def bonds():
     dsp.printmd(table_str)
 
 
-def swaps():
+def swaps(T: list[int], n: int, spot_rates: list[float], forward_rates: list[float]):
     print("QUESTION 2b")
-    bond_prices = [
-        99412,
-        97339,
-        94983,
-        94801,
-        94699,
-        94454,
-        93701,
-        93674,
-        93076,
-        92814,
-        91959,
-        91664,
-        87384,
-        87329,
-        86576,
-        84697,
-        82642,
-        82350,
-        82207,
-        81725,
-    ]
-
-    num_bonds = 20
-    assert (len(bond_prices) == num_bonds)
-    F = 100_000
-    c = 0.04
-    n = 1  # annual
-    T = [k for k in range(1, num_bonds + 1)]
-
-    spot_rates, forward_rates = bond.recursive_zero_coupon_yield_continuous(
-        bond_prices, F, T, c, n
-    )
-
     col_heads = ["Time Step", "Year", "Spot Rate", "Forward Rate"]
     col_spaces = [10, 6, 11, 14]
     col_decimals = [None, None, 5, 5]
@@ -131,11 +106,38 @@ def swaps():
     table_str = table.generate_table(
         col_heads, col_spaces, table_data, col_decimals)
 
+    dsp.printmd(table_str)
+
     print("Spot rates")
     print(spot_rates)
     print("\n\nForward rates")
     print(forward_rates)
 
+    print("QUESTION 2c")
+    notional = 1_000_000
+    fixed_rate = 0.065
+    floating_spread = 0.01
+
+    swap_values, _, swap_table_str = swap.compute_swap_values(
+        notional, T, n, spot_rates, forward_rates, fixed_rate, floating_spread)
+
+    dsp.printmd(swap_table_str)
+    print("Sum Swap:", swap_values.sum())
+
+    print("QUESTION 2e")
+    # The sum of swap values is linear in the fixed rate, so solve for it directly
+    swap_rate = swap.par_swap_rate(
+        notional, T, n, spot_rates, forward_rates, floating_spread)
+    sum_swap = swap.sum_swap_values(
+        notional, T, n, spot_rates, forward_rates, swap_rate, floating_spread)
+
+    print(
+        f"\n{Fore.LIGHTGREEN_EX}FOUND: swap rate: {swap_rate:.6f}, sum of swap values: {sum_swap:.4f} ~ {0}{Style.RESET_ALL}")
+
+    _, _, swap_table_str = swap.compute_swap_values(
+        notional, T, n, spot_rates, forward_rates, swap_rate, floating_spread)
+    dsp.printmd(swap_table_str)
+
 
 def strip_test():
     """
@@ -213,11 +215,13 @@ def lattice():
 
 
 def main():
-    bonds()
+    T, n, spot_rates, forward_rates = yield_curve()
+
+    bonds(T, spot_rates, forward_rates)
 
     # strip_test()
 
-    # swaps()
+    swaps(T, n, spot_rates, forward_rates)
 
     lattice()
 
@@ -3,7 +3,8 @@ Helper for computing swap values in contracts / borrowing
 """
 
 import interest
-from typing import List, Tuple
+from typing import Tuple
+import numpy as np
 import table
 
 
@@ -73,7 +74,8 @@ def fix_float_delta(fixed_payment: float, floating_payment: float) -> float:
 
 def swap_value_at_spot(fixed_payment: float, floating_payment: float, spot_rate: float, time_period: float) -> float:
     """
-    Calculate the swap value.
+    Calculate the swap value at a single maturity. The valuations below work on every
+    maturity at once, but this is kept as part of the public API for one-off values.
 
     Args:
         fixed_payment: float
@@ -100,8 +102,194 @@ def swap_value_at_spot(fixed_payment: float, floating_payment: float, spot_rate:
     return swap_value
 
 
+def _discount_factors_and_floating_payments(notional: float, maturity_periods: list[int], compounding_frequency_yr: int, spot_rates: list[float],
+                                            forward_rates: list[float], floating_spread: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the discount factor and floating payment at each maturity. Neither depends
+    on the fixed rate, so every swap valuation below is built from these.
+
+    Args:
+        notional: float
+            The notional amount.
+        maturity_periods: list[int]
+            A list of the years to maturity for each bond
+        compounding_frequency_yr: int
+            The frequency at which the interest is compounded.
+        spot_rates: list[float]
+            The spot rates.
+        forward_rates: list[float]
+            The forward rates.
+        floating_spread: float
+            The floating offset.
+
+    Returns:
+        Tuple:
+            discount_factors: np.ndarray
+                The continuously compounded discount factor at each spot rate.
+            floating_payments: np.ndarray
+                The floating payment at each maturity.
+    """
+
+    maturity_periods = np.asarray(maturity_periods, dtype=np.float64)
+    spot_rates = np.asarray(spot_rates)
+    forward_rates = np.asarray(forward_rates)
+
+    discount_factors = interest.continuous_compound_interest_discounted(
+        spot_rates, maturity_periods)
+    floating_payments = floating_payment_continuous_compounding(
+        notional, forward_rates, floating_spread, compounding_frequency_yr)
+
+    return discount_factors, floating_payments
+
+
+def _swap_legs(notional: float, maturity_periods: list[int], compounding_frequency_yr: int, spot_rates: list[float], forward_rates: list[float],
+               floating_spread: float) -> Tuple[float, float]:
+    """
+    Compute the parts of a swap's value that do not depend on the fixed rate.
+
+    Args:
+        notional: float
+            The notional amount.
+        maturity_periods: list[int]
+            A list of the years to maturity for each bond
+        compounding_frequency_yr: int
+            The frequency at which the interest is compounded.
+        spot_rates: list[float]
+            The spot rates.
+        forward_rates: list[float]
+            The forward rates.
+        floating_spread: float
+            The floating offset.
+
+    Returns:
+        Tuple:
+            sum_discount_factors: float
+                The sum of the discount factors at each spot rate.
+            floating_leg: float
+                The present value of the floating payments.
+    """
+
+    discount_factors, floating_payments = _discount_factors_and_floating_payments(
+        notional, maturity_periods, compounding_frequency_yr, spot_rates, forward_rates, floating_spread)
+
+    sum_discount_factors = float(discount_factors.sum())
+    floating_leg = float(np.dot(floating_payments, discount_factors))
+
+    return sum_discount_factors, floating_leg
+
+
+def par_swap_rate(notional: float, maturity_periods: list[int], compounding_frequency_yr: int, spot_rates: list[float], forward_rates: list[float],
+                  floating_spread: float) -> float:
+    """
+    Compute the fixed rate at which the sum of the swap values is zero.
+    The sum is linear in the fixed rate, so the rate is found exactly without a search.
+
+    Args:
+        notional: float
+            The notional amount.
+        maturity_periods: list[int]
+            A list of the years to maturity for each bond
+        compounding_frequency_yr: int
+            The frequency at which the interest is compounded.
+        spot_rates: list[float]
+            The spot rates.
+        forward_rates: list[float]
+            The forward rates.
+        floating_spread: float
+            The floating offset.
+
+    Returns:
+        fixed_rate: float
+            The swap rate.
+    """
+
+    sum_discount_factors, floating_leg = _swap_legs(
+        notional, maturity_periods, compounding_frequency_yr, spot_rates, forward_rates, floating_spread)
+
+    fixed_rate = floating_leg / (notional * sum_discount_factors)
+
+    return fixed_rate
+
+
+def swap_values_at_rates(notional: float, maturity_periods: list[int], compounding_frequency_yr: int, spot_rates: list[float], forward_rates: list[float],
+                         fixed_rates: np.ndarray, floating_spread: float) -> np.ndarray:
+    """
+    Compute the swap value at each maturity for many candidate fixed rates at once
+    by broadcasting the fixed payments against the floating payments.
+
+    Args:
+        notional: float
+            The notional amount.
+        maturity_periods: list[int]
+            A list of the years to maturity for each bond
+        compounding_frequency_yr: int
+            The frequency at which the interest is compounded.
+        spot_rates: list[float]
+            The spot rates.
+        forward_rates: list[float]
+            The forward rates.
+        fixed_rates: np.ndarray
+            The candidate fixed rates. May also be a single rate.
+        floating_spread: float
+            The floating offset.
+
+    Returns:
+        swap_values: np.ndarray
+            The swap values with shape (len(fixed_rates), len(maturity_periods)),
+            or (len(maturity_periods),) if a single rate is given.
+    """
+
+    discount_factors, floating_payments = _discount_factors_and_floating_payments(
+        notional, maturity_periods, compounding_frequency_yr, spot_rates, forward_rates, floating_spread)
+
+    # Trailing axis so each fixed rate lines up against every maturity
+    fixed_payments = fixed_payment_continuous_compounding(
+        notional, np.asarray(fixed_rates, dtype=np.float64))[..., np.newaxis]
+
+    swap_values = fix_float_delta(fixed_payments, floating_payments) * discount_factors
+
+    return swap_values
+
+
+def sum_swap_values(notional: float, maturity_periods: list[int], compounding_frequency_yr: int, spot_rates: list[float], forward_rates: list[float],
+                    fixed_rates: np.ndarray, floating_spread: float) -> np.ndarray:
+    """
+    Compute the sum of the swap values for many candidate fixed rates at once.
+    The discount factors and floating leg do not depend on the fixed rate, so
+    they are computed once and each candidate only costs a multiply.
+
+    Args:
+        notional: float
+            The notional amount.
+        maturity_periods: list[int]
+            A list of the years to maturity for each bond
+        compounding_frequency_yr: int
+            The frequency at which the interest is compounded.
+        spot_rates: list[float]
+            The spot rates.
+        forward_rates: list[float]
+            The forward rates.
+        fixed_rates: np.ndarray
+            The candidate fixed rates.
+        floating_spread: float
+            The floating offset.
+
+    Returns:
+        sum_swap_values: np.ndarray
+            The sum of the swap values for each fixed rate.
+    """
+
+    sum_discount_factors, floating_leg = _swap_legs(
+        notional, maturity_periods, compounding_frequency_yr, spot_rates, forward_rates, floating_spread)
+
+    fixed_rates = np.asarray(fixed_rates, dtype=np.float64)
+    sum_swap_values = notional * fixed_rates * sum_discount_factors - floating_leg
+
+    return sum_swap_values
+
+
 def compute_swap_values(notional: float, maturity_periods: list[int], compounding_frequency_yr: int, spot_rates: list[float], forward_rates: list[float],
-                        fixed_rate: float, floating_spread: float) -> Tuple[list[float], List, str]:
+                        fixed_rate: float, floating_spread: float) -> Tuple[np.ndarray, np.ndarray, str]:
     """
     Compute the swap values for a list of spot rates and forward rates as well as 
     fixed and floating rates.
@@ -124,41 +312,31 @@ def compute_swap_values(notional: float, maturity_periods: list[int], compoundin
 
     Returns:
         Tuple:
-            swap_values: list[float]
+            swap_values: np.ndarray
                 The swap values.
-            swap_table_data: List
-                The data for the swap table. Columns: $n$, $y_{0,n}$, $y_{n-1, n}$, 
+            swap_table_data: np.ndarray
+                The data for the swap table, one row per maturity. Columns: $n$, $y_{0,n}$, $y_{n-1, n}$, 
                                                         Fixed Payment, Floating Payment, 
                                                         Fixed - Floating, PV @ Spot
             swap_table_str: str
                 The swap table in markdown format.
     """
 
-    swap_values = []
-
     # Compute once as this doesn't change.
     fixed_payment = fixed_payment_continuous_compounding(notional, fixed_rate)
 
-    table_data = []
-
-    for k, T in enumerate(maturity_periods):
-        spot_rate = spot_rates[k]
-        forward_rate = forward_rates[k]
-
-        floating_payment = floating_payment_continuous_compounding(
-            notional, forward_rate, floating_spread, compounding_frequency_yr)
-
-        swap_value = swap_value_at_spot(
-            fixed_payment, floating_payment, spot_rate, T)
+    # Every maturity at once
+    discount_factors, floating_payments = _discount_factors_and_floating_payments(
+        notional, maturity_periods, compounding_frequency_yr, spot_rates, forward_rates, floating_spread)
 
-        swap_values.append(swap_value)
+    fix_float = fix_float_delta(fixed_payment, floating_payments)
 
-        fix_float = fix_float_delta(fixed_payment, floating_payment)
+    swap_values = fix_float * discount_factors
 
-        # Add to table data
-        row = [T, spot_rate, forward_rate, fixed_payment, floating_payment,
-               fix_float, swap_value]
-        table_data.append(row)
+    # One column per quantity, stacked into rows only for the table
+    table_data = np.column_stack([np.asarray(maturity_periods, dtype=np.float64), spot_rates, forward_rates,
+                                  np.full_like(swap_values, fixed_payment), floating_payments,
+                                  fix_float, swap_values])
 
     col_heads = ["$n$", "$y_{0,n}$", "$y_{n-1, n}$",
                  "Fixed Payment", "Floating Payment", "Fixed - Floating", "PV @ Spot"]
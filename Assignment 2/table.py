@@ -19,18 +19,18 @@ def generate_table_header(col_heads: List[str], col_spaces: List[int]) -> Tuple[
             The format row.
     """
 
-    header_row = ""
-    format_row = ""
+    header_parts = []
+    format_parts = []
 
     for i, col_head in enumerate(col_heads):
         space = col_spaces[i]
-        part = f"|{col_head:^{space}}"
-        header_row += part
-        middle = '-'*(max(1, len(part) - 2 - 2))
-        format_row += f"| :{middle}: "
+        part = f"{col_head:^{space}}"
+        header_parts.append(part)
+        middle = '-'*(max(1, len(part) - 1 - 2))
+        format_parts.append(f" :{middle}: ")
 
-    header_row += "|"
-    format_row += "|"
+    header_row = "|" + "|".join(header_parts) + "|"
+    format_row = "|" + "|".join(format_parts) + "|"
 
     return header_row, format_row
 
@@ -62,18 +62,47 @@ def generate_table_row(row_data: List[str], col_spaces: List[int], col_decimals:
         raise ValueError(
             "Number of columns does not match number of column decimals")
 
-    row = ""
+    row = _render_row(row_data, _column_formats(col_spaces, col_decimals))
 
-    for i, data in enumerate(row_data):
-        space = col_spaces[i]
-        decimals = col_decimals[i]
+    return row
+
+
+def _column_formats(col_spaces: List[int], col_decimals: Union[None, List[None | int]]) -> List[Tuple[str, Union[None, str]]]:
+    """
+    Build the format strings for each column once so they can be reused for every row.
+
+    Returns:
+        formats: List[Tuple[str, Union[None, str]]]
+            The centring format and the number format (None for strings) of each column.
+    """
+
+    if col_decimals is None:
+        col_decimals = [None] * len(col_spaces)
 
-        if decimals is not None:
-            data = f"{float(data):.{decimals}f}"
+    formats = [(f"{{:^{space}}}", None if decimals is None else f"{{:.{decimals}f}}")
+               for space, decimals in zip(col_spaces, col_decimals)]
 
-        row += f"|{data:^{space}}"
+    return formats
 
-    row += "|"
+
+def _render_row(row_data: List[str], formats: List[Tuple[str, Union[None, str]]]) -> str:
+    """
+    Render a table row using the prepared column formats.
+    """
+
+    if len(row_data) != len(formats):
+        raise ValueError(
+            "Number of columns does not match number of column spaces")
+
+    parts = []
+
+    for data, (centre_format, number_format) in zip(row_data, formats):
+        if number_format is not None:
+            data = number_format.format(float(data))
+
+        parts.append(centre_format.format(data))
+
+    row = "|" + "|".join(parts) + "|"
 
     return row
 
@@ -99,11 +128,21 @@ def generate_table(
             The table.
     """
 
+    if col_decimals is not None and len(col_decimals) != len(col_spaces):
+        raise ValueError(
+            "Number of column decimals does not match number of column spaces")
+
     header_row, format_row = generate_table_header(col_heads, col_spaces)
 
-    table = header_row + "\n" + format_row + "\n"
+    formats = _column_formats(col_spaces, col_decimals)
+
+    rows = [header_row, format_row]
 
     for row_data in data:
-        table += generate_table_row(row_data, col_spaces, col_decimals) + "\n"
+        rows.append(_render_row(row_data, formats))
+
+    # Trailing newline after the last row
+    rows.append("")
+    table = "\n".join(rows)
 
     return table